@@ -3,10 +3,14 @@
  * Real-time monitoring and control interface
  */
 
+// Expected Kangaroo operations for the Bitcoin Puzzle #73 range (2^72 keys)
+const EXPECTED_OPERATIONS = Math.sqrt(Math.pow(2, 73) - Math.pow(2, 72)) * 1.25;
+
 class KangarooSolverApp {
     constructor() {
         this.isRunning = false;
         this.updateInterval = null;
+        this.eventSource = null;
         this.chart = null;
         this.chartData = {
             labels: [],
@@ -196,23 +200,53 @@ class KangarooSolverApp {
     }
     
     startStatusUpdates() {
+        // Prefer the server-sent stats stream over polling
+        if (window.EventSource) {
+            this.eventSource = new EventSource('/api/stream');
+            this.eventSource.onmessage = (event) => {
+                this.handleStatus(JSON.parse(event.data));
+            };
+            this.eventSource.onerror = () => {
+                // EventSource reconnects on its own
+                if (this.shouldLogError()) {
+                    this.logMessage('ERROR', 'Status stream disconnected, reconnecting...');
+                }
+            };
+            return;
+        }
+        
         // Update every second
         this.updateInterval = setInterval(() => {
             this.updateStatus();
         }, 1000);
     }
     
+    stopStatusUpdates() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
+        if (this.updateInterval) {
+            clearInterval(this.updateInterval);
+            this.updateInterval = null;
+        }
+    }
+    
+    handleStatus(response) {
+        if (response.success) {
+            this.updateUI(response.data);
+            
+            // Check if puzzle is solved
+            if (response.data.is_solved) {
+                this.showSolutionModal(response.data);
+            }
+        }
+    }
+    
     async updateStatus() {
         try {
             const response = await this.makeRequest('/api/status');
-            if (response.success) {
-                this.updateUI(response.data);
-                
-                // Check if puzzle is solved
-                if (response.data.is_solved) {
-                    this.showSolutionModal(response.data);
-                }
-            }
+            this.handleStatus(response);
         } catch (error) {
             // Don't spam log with connection errors
             if (this.shouldLogError(error)) {
@@ -330,7 +364,14 @@ class KangarooSolverApp {
         try {
             this.logMessage('INFO', 'Saving checkpoint...');
             
-            const response = await this.makeRequest('/api/checkpoint/save', 'POST');
+            let response = await this.makeRequest('/api/checkpoint/save', 'POST');
+            
+            // Saves are queued on the server; wait for the job to finish
+            const jobId = response.job_id;
+            while (jobId && response.success && response.status !== 'done') {
+                await new Promise(resolve => setTimeout(resolve, 500));
+                response = await this.makeRequest(`/api/checkpoint/status/${jobId}`);
+            }
             
             if (response.success) {
                 this.logMessage('INFO', 'Checkpoint saved successfully');
@@ -438,10 +479,7 @@ class KangarooSolverApp {
         this.logMessage('SUCCESS', `🎉 PUZZLE SOLVED! Private key: ${data.found_key}`);
         
         // Stop updates since puzzle is solved
-        if (this.updateInterval) {
-            clearInterval(this.updateInterval);
-            this.updateInterval = null;
-        }
+        this.stopStatusUpdates();
     }
     
     closeSolutionModal() {
@@ -534,9 +572,7 @@ class KangarooSolverApp {
         }
         
         const jumpRate = data.total_jumps / data.elapsed_time;
-        const searchSpace = Math.pow(2, 73) - Math.pow(2, 72); // Bitcoin Puzzle #73 range
-        const expectedOperations = Math.sqrt(searchSpace) * 1.25; // Kangaroo efficiency factor
-        const remainingOperations = Math.max(0, expectedOperations - data.total_jumps);
+        const remainingOperations = Math.max(0, EXPECTED_OPERATIONS - data.total_jumps);
         
         if (remainingOperations <= 0) {
             return 'Soon';
@@ -3,10 +3,45 @@ Configuration management for Bitcoin Puzzle #73 Kangaroo Solver
 """
 
 import os
-import json
 import multiprocessing
+import threading
+import json_utils
+
+# Parsed config files keyed by (absolute path, mtime in ns)
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+# Bounded integer settings as key -> (minimum, maximum)
+_CONFIG_BOUNDS = {
+    "threads": (1, 64),
+    "distinguished_bits": (8, 32),
+    "jump_distance_bits": (1, 64)
+}
+
+def _invalidate_config_cache(path):
+    """Drop cached entries for the given absolute config path"""
+    with _CONFIG_CACHE_LOCK:
+        for key in [k for k in _CONFIG_CACHE if k[0] == path]:
+            del _CONFIG_CACHE[key]
 
 class Config:
+    # Shared instances keyed by absolute config path, see get_instance()
+    _instances = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls, config_file="config.json"):
+        """Get the process-wide Config for config_file, creating it on first use"""
+        path = os.path.abspath(config_file)
+        instance = cls._instances.get(path)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(path)
+                if instance is None:
+                    instance = cls(config_file)
+                    cls._instances[path] = instance
+        return instance
+    
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
         self.default_config = {
@@ -27,20 +62,69 @@ class Config:
         }
         
         self.config = self.load_config()
+        self.resolve_settings()
+    
+    def resolve_settings(self):
+        """Resolve configuration values into attributes read by the getters"""
+        config = self.config
+        self.threads = config["threads"]
+        self.distinguished_bits = config["distinguished_bits"]
+        self.checkpoint_interval = config.get("checkpoint_interval", 300)
+        self.jump_distance_bits = config["jump_distance_bits"]
+        self.max_distinguished_points = config.get("max_distinguished_points", 1000000)
+        self.target_address = config.get("target_address", "12VVRNPi4SJqUTsp6FmqDqY5sGosDtysn4")
+        self.target_pubkey = config.get("target_pubkey", "03c9f4a96d8e8d2c1c5b8c8f4e8c5a5c3f5c1c7e8f4b2a1d6c3e9f8d2c5b8e7a4f1c")
+        self.puzzle_number = config.get("puzzle_number", 73)
+        self.range_start = config.get("range_start", "1000000000000000000")
+        self.range_end = config.get("range_end", "1ffffffffffffffffff")
+        self.web_port = config.get("web_interface_port", 5000)
+        self.log_level = config.get("log_level", "INFO")
+        self.auto_save = config.get("auto_save", True)
+        self.backup_checkpoints = config.get("backup_checkpoints", True)
+    
+    def validate_config(self, config, strict=False):
+        """Coerce and clamp bounded values in place; invalid values fall back to defaults unless strict"""
+        for key, (low, high) in _CONFIG_BOUNDS.items():
+            try:
+                value = int(config.get(key, self.default_config[key]))
+            except (ValueError, TypeError):
+                if strict:
+                    raise
+                print(f"Warning: Invalid {key} value {config.get(key)!r}, using default")
+                value = self.default_config[key]
+            config[key] = min(max(low, value), high)
+        return config
     
     def load_config(self):
         """Load configuration from file or create default"""
-        if os.path.exists(self.config_file):
+        path = os.path.abspath(self.config_file)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if mtime is not None:
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    merged_config = self.default_config.copy()
-                    merged_config.update(config)
-                    return merged_config
+                key = (path, mtime)
+                with _CONFIG_CACHE_LOCK:
+                    config = _CONFIG_CACHE.get(key)
+                
+                if config is None:
+                    with open(path, 'rb') as f:
+                        config = json_utils.loads(f.read())
+                    _invalidate_config_cache(path)
+                    with _CONFIG_CACHE_LOCK:
+                        _CONFIG_CACHE[key] = config
+                
+                # Merge with defaults to ensure all keys exist
+                merged_config = self.default_config.copy()
+                merged_config.update(config)
+                return self.validate_config(merged_config)
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}")
                 print("Using default configuration")
+                # Leave the existing file alone so it can be fixed by hand
+                return self.default_config.copy()
         
         # Create default config file
         self.save_config(self.default_config)
@@ -51,83 +135,84 @@ class Config:
         if config is None:
             config = self.config
         
+        _invalidate_config_cache(os.path.abspath(self.config_file))
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            with open(self.config_file, 'wb') as f:
+                f.write(json_utils.dumps(config, indent=True))
         except Exception as e:
             print(f"Warning: Could not save config file: {e}")
     
     def get_threads(self):
         """Get number of threads to use"""
-        threads = self.config.get("threads", multiprocessing.cpu_count())
-        return min(max(1, threads), 64)  # Clamp between 1 and 64
+        return self.threads
     
     def get_distinguished_bits(self):
         """Get number of distinguished bits"""
-        return self.config.get("distinguished_bits", 20)
+        return self.distinguished_bits
     
     def get_checkpoint_interval(self):
         """Get checkpoint save interval in seconds"""
-        return self.config.get("checkpoint_interval", 300)
+        return self.checkpoint_interval
     
     def get_jump_distance_bits(self):
         """Get jump distance bits"""
-        return self.config.get("jump_distance_bits", 16)
+        return self.jump_distance_bits
     
     def get_max_distinguished_points(self):
         """Get maximum distinguished points to store"""
-        return self.config.get("max_distinguished_points", 1000000)
+        return self.max_distinguished_points
     
     def get_target_address(self):
         """Get target Bitcoin address"""
-        return self.config.get("target_address", "12VVRNPi4SJqUTsp6FmqDqY5sGosDtysn4")
+        return self.target_address
     
     def get_target_pubkey(self):
         """Get target public key"""
-        return self.config.get("target_pubkey", "03c9f4a96d8e8d2c1c5b8c8f4e8c5a5c3f5c1c7e8f4b2a1d6c3e9f8d2c5b8e7a4f1c")
+        return self.target_pubkey
     
     def get_puzzle_number(self):
         """Get puzzle number"""
-        return self.config.get("puzzle_number", 73)
+        return self.puzzle_number
     
     def get_range_start(self):
         """Get search range start"""
-        return self.config.get("range_start", "1000000000000000000")
+        return self.range_start
     
     def get_range_end(self):
         """Get search range end"""
-        return self.config.get("range_end", "1ffffffffffffffffff")
+        return self.range_end
     
     def get_web_port(self):
         """Get web interface port"""
-        return self.config.get("web_interface_port", 5000)
+        return self.web_port
     
     def get_log_level(self):
         """Get logging level"""
-        return self.config.get("log_level", "INFO")
+        return self.log_level
     
     def is_auto_save_enabled(self):
         """Check if auto-save is enabled"""
-        return self.config.get("auto_save", True)
+        return self.auto_save
     
     def is_backup_enabled(self):
         """Check if checkpoint backup is enabled"""
-        return self.config.get("backup_checkpoints", True)
+        return self.backup_checkpoints
     
     def update_config(self, key, value):
-        """Update a configuration value"""
-        self.config[key] = value
+        """Update a configuration value; raises without changing anything if it is invalid"""
+        config = self.config.copy()
+        config[key] = value
+        self.config = self.validate_config(config, strict=True)
+        self.resolve_settings()
         self.save_config()
     
     def reset_to_defaults(self):
         """Reset configuration to defaults"""
         self.config = self.default_config.copy()
+        self.resolve_settings()
         self.save_config()
     
     def print_config(self):
         """Print current configuration"""
-        print("Current Configuration:")
-        print("=" * 40)
-        for key, value in self.config.items():
-            print(f"{key:25}: {value}")
-        print("=" * 40)
+        lines = "\n".join(f"{key:25}: {value}" for key, value in self.config.items())
+        print(f"Current Configuration:\n{'=' * 40}\n{lines}\n{'=' * 40}")
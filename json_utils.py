@@ -0,0 +1,29 @@
+"""
+JSON encoding helpers for Bitcoin Puzzle #73 Kangaroo Solver
+Uses orjson or ujson when available and falls back to the standard library
+"""
+
+try:
+    import orjson
+
+    def dumps(obj, indent=False):
+        """Serialize obj to JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    loads = orjson.loads
+
+except ImportError:
+    try:
+        import ujson as _json
+        _COMPACT = {}
+    except ImportError:
+        import json as _json
+        _COMPACT = {"separators": (",", ":")}
+
+    def dumps(obj, indent=False):
+        """Serialize obj to JSON bytes"""
+        if indent:
+            return _json.dumps(obj, indent=2).encode('utf-8')
+        return _json.dumps(obj, **_COMPACT).encode('utf-8')
+
+    loads = _json.loads
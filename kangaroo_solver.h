@@ -118,6 +118,8 @@ extern "C" {
     bool kangaroo_start();
     void kangaroo_stop();
     bool kangaroo_get_stats(KangarooStats* stats);
+    int kangaroo_stats_size();
+    int kangaroo_get_stats_json(char* buffer, int buffer_size);
     bool kangaroo_save_checkpoint(const char* filename);
     bool kangaroo_load_checkpoint(const char* filename);
 }
@@ -4,6 +4,14 @@ Bitcoin Puzzle #73 Kangaroo Solver - Main Interface
 Implements Pollard's Kangaroo algorithm for solving discrete logarithm problem
 """
 
+# Patch blocking calls for gevent's cooperative server when it is installed.
+# This has to run before anything below imports threading, socket or signal.
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass
+
 import os
 import sys
 import time
@@ -11,18 +19,33 @@ import threading
 import signal
 from web_server import KangarooWebServer
 
+# Static startup text, written in one call each
+_BANNER = "\n".join([
+    "🦘 Bitcoin Puzzle #73 Kangaroo Solver",
+    "=" * 50,
+    "Starting web interface...",
+    "",
+    "Target Information:",
+    "  Puzzle: #73",
+    "  Address: 12VVRNPi4SJqUTsp6FmqDqY5sGosDtysn4",
+    "  Range: 0x1000000000000000000 - 0x1ffffffffffffffffff",
+    "  Search Space: 2^72 (≈ 4.7 × 10^21)",
+    "",
+    ""
+])
+
+_SERVER_INFO = "\n".join([
+    "🌐 Web interface starting on http://0.0.0.0:5000",
+    "   Access the solver dashboard in your browser",
+    "   Press Ctrl+C to stop",
+    "=" * 50,
+    ""
+])
+
 def main():
     """Main entry point for Bitcoin Puzzle #73 Kangaroo Solver"""
-    print("🦘 Bitcoin Puzzle #73 Kangaroo Solver")
-    print("=" * 50)
-    print("Starting web interface...")
-    print()
-    print("Target Information:")
-    print("  Puzzle: #73")
-    print("  Address: 12VVRNPi4SJqUTsp6FmqDqY5sGosDtysn4")
-    print("  Range: 0x1000000000000000000 - 0x1ffffffffffffffffff")
-    print("  Search Space: 2^72 (≈ 4.7 × 10^21)")
-    print()
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
     
     # Setup signal handlers
     def signal_handler(signum, frame):
@@ -35,10 +58,8 @@ def main():
     try:
         # Create and start the web server
         server = KangarooWebServer()
-        print("🌐 Web interface starting on http://0.0.0.0:5000")
-        print("   Access the solver dashboard in your browser")
-        print("   Press Ctrl+C to stop")
-        print("=" * 50)
+        sys.stdout.write(_SERVER_INFO)
+        sys.stdout.flush()
         
         server.run(host='0.0.0.0', port=5000, debug=False)
         
@@ -3,10 +3,51 @@ Monitoring and statistics for Bitcoin Puzzle #73 Kangaroo Solver
 """
 
 import time
-import json
 import os
+import math
+import atexit
 from datetime import datetime, timedelta
 import threading
+from collections import deque
+import json_utils
+
+# Queued log lines are written out after this many events, or once this many
+# seconds have passed since the last write
+LOG_FLUSH_LINES = 64
+LOG_FLUSH_INTERVAL = 1.0
+
+# Kangaroo algorithm expected operations (birthday paradox) over the
+# Bitcoin Puzzle #73 range; this is a very rough estimate
+_EXPECTED_OPS = 1.25 * math.sqrt(float(2**73 - 2**72))
+
+# (threshold, suffix) pairs used by format_number, largest first
+_NUMBER_SUFFIXES = ((1e12, "T"), (1e9, "G"), (1e6, "M"), (1e3, "K"))
+
+_REPORT_TEMPLATE = """
+BITCOIN PUZZLE #73 KANGAROO SOLVER REPORT
+========================================
+Generated: {now}
+
+PERFORMANCE METRICS:
+- Runtime: {runtime}
+- Total Jumps: {total_jumps}
+- Distinguished Points: {distinguished_points}
+- Jump Rate: {jump_rate}
+- DP Rate: {dp_rate}
+- Active Threads: {threads}
+- Collisions Found: {collisions}
+
+SEARCH PROGRESS:
+- Range Start: 0x{current_range_start}
+- Range End: 0x{current_range_end}
+- Estimated Completion: {eta}
+- Status: {status}
+
+SYSTEM INFO:
+- Last Checkpoint: {last_checkpoint}
+- Log File: {log_file}
+- Config File: config.json
+"""
 
 class Monitor:
     def __init__(self):
@@ -28,20 +69,38 @@ class Monitor:
             "cpu_usage": 0
         }
         
-        self.history = []
+        self.history = deque(maxlen=1000)
+        self.start_mono = None
         self.lock = threading.Lock()
+        
+        # Immutable copies published by update_stats for lock-free readers
+        self.stats_snapshot = dict(self.stats)
+        self.history_snapshot = ()
         self.log_file = "kangaroo_solver.log"
+        self.log_lock = threading.Lock()
+        self.log_queue = []
+        self.log_timestamp = (0, "")  # (epoch second, formatted string)
+        self.log_fd = None  # Opened on the first flush, see open_log()
+        self.log_disabled = False
+        self.log_written = 0.0  # Monotonic time of the last write
+        self.log_timer = None
         
     def start_monitoring(self):
         """Start the monitoring system"""
-        self.stats["start_time"] = time.time()
+        with self.lock:
+            self.stats["start_time"] = time.time()
+            self.start_mono = time.monotonic_ns()
+            self.stats_snapshot = dict(self.stats)
         self.log_event("INFO", "Monitoring started")
     
     def update_stats(self, new_stats):
         """Update statistics"""
+        now = time.time()
+        mono = time.monotonic_ns()
+        
         with self.lock:
             self.stats.update(new_stats)
-            self.stats["uptime"] = time.time() - self.stats["start_time"] if self.stats["start_time"] else 0
+            self.stats["uptime"] = (mono - self.start_mono) / 1e9 if self.start_mono is not None else 0
             
             # Calculate rates
             if self.stats["uptime"] > 0:
@@ -50,50 +109,118 @@ class Monitor:
             
             # Add to history (keep last 1000 entries)
             self.history.append({
-                "timestamp": time.time(),
+                "timestamp": now,
+                "monotonic_ns": mono,
                 "total_jumps": self.stats["total_jumps"],
                 "distinguished_points": self.stats["distinguished_points"],
                 "jump_rate": self.stats["jump_rate"]
             })
             
-            if len(self.history) > 1000:
-                self.history.pop(0)
+            # Publish fresh snapshots; readers never take the lock
+            self.stats_snapshot = dict(self.stats)
+            self.history_snapshot = tuple(self.history)
     
     def get_stats(self):
-        """Get current statistics"""
-        with self.lock:
-            return self.stats.copy()
+        """Get current statistics (shared snapshot, do not modify)"""
+        return self.stats_snapshot
     
     def get_history(self):
-        """Get statistics history"""
-        with self.lock:
-            return self.history.copy()
+        """Get statistics history (shared snapshot, do not modify)"""
+        return self.history_snapshot
+    
+    def recent_jump_rate(self, window=60):
+        """Get the jump rate over the last `window` history entries"""
+        if window < 2:
+            raise ValueError("window must cover at least 2 history entries")
+        
+        history = self.history_snapshot
+        if len(history) < 2:
+            return 0
+        first = history[max(0, len(history) - window)]
+        last = history[-1]
+        
+        # Monotonic clock, so NTP adjustments can't skew the rate
+        elapsed = (last["monotonic_ns"] - first["monotonic_ns"]) / 1e9
+        if elapsed <= 0:
+            return 0
+        return (last["total_jumps"] - first["total_jumps"]) / elapsed
     
     def log_event(self, level, message):
         """Log an event with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Format the timestamp at most once per wall-clock second
+        second = int(time.time())
+        cached_second, timestamp = self.log_timestamp
+        if second != cached_second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            self.log_timestamp = (second, timestamp)
+        
         log_entry = f"[{timestamp}] {level}: {message}"
         
         print(log_entry)
         
+        if self.log_disabled:
+            return
+        
+        with self.log_lock:
+            self.log_queue.append(log_entry.encode('utf-8'))
+            flush = (len(self.log_queue) >= LOG_FLUSH_LINES
+                     or time.monotonic() - self.log_written >= LOG_FLUSH_INTERVAL)
+            
+            # Otherwise make sure the queued lines reach disk within the interval
+            if not flush and self.log_timer is None:
+                self.log_timer = threading.Timer(LOG_FLUSH_INTERVAL, self.flush_log)
+                self.log_timer.daemon = True
+                self.log_timer.start()
+        
+        if flush or level in ("ERROR", "CRITICAL"):
+            self.flush_log()
+    
+    def open_log(self):
+        """Open the log file for appending; call with log_lock held"""
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry + "\n")
-        except Exception as e:
-            print(f"Warning: Could not write to log file: {e}")
+            self.log_fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError as e:
+            print(f"Warning: Could not open log file: {e}")
+            self.log_disabled = True
+            self.log_queue.clear()
+            return False
+        atexit.register(self.close_log)
+        return True
+    
+    def flush_log(self):
+        """Write queued log lines to the log file in a single write"""
+        with self.log_lock:
+            if self.log_timer is not None:
+                self.log_timer.cancel()
+                self.log_timer = None
+            if not self.log_queue:
+                return
+            if self.log_fd is None and not self.open_log():
+                return
+            data = b"\n".join(self.log_queue) + b"\n"
+            self.log_queue.clear()
+            self.log_written = time.monotonic()
+            
+            try:
+                os.write(self.log_fd, data)
+            except OSError as e:
+                print(f"Warning: Could not write to log file: {e}")
+    
+    def close_log(self):
+        """Flush pending log lines and close the log file"""
+        self.flush_log()
+        with self.log_lock:
+            if self.log_fd is not None:
+                os.close(self.log_fd)
+                self.log_fd = None
+                atexit.unregister(self.close_log)
     
     def format_number(self, number):
         """Format large numbers with appropriate suffixes"""
-        if number >= 1e12:
-            return f"{number/1e12:.2f}T"
-        elif number >= 1e9:
-            return f"{number/1e9:.2f}G"
-        elif number >= 1e6:
-            return f"{number/1e6:.2f}M"
-        elif number >= 1e3:
-            return f"{number/1e3:.2f}K"
-        else:
-            return str(number)
+        for threshold, suffix in _NUMBER_SUFFIXES:
+            if number >= threshold:
+                return f"{number/threshold:.2f}{suffix}"
+        return str(number)
     
     def format_time(self, seconds):
         """Format seconds into human readable time"""
@@ -130,30 +257,24 @@ class Monitor:
         """Estimate completion time (very rough)"""
         stats = self.get_stats()
         
-        if stats["jump_rate"] <= 0:
-            return "Unknown"
-        
-        # Bitcoin Puzzle #73 search space
-        search_space = 2**73 - 2**72  # Range size
+        jump_rate = stats["jump_rate"]
         
-        # Kangaroo algorithm expected operations (birthday paradox)
-        # This is a very rough estimate
-        expected_operations = (search_space ** 0.5) * 1.25  # Efficiency factor
+        if jump_rate <= 0:
+            return "Unknown"
         
-        remaining_operations = max(0, expected_operations - stats["total_jumps"])
+        remaining_operations = _EXPECTED_OPS - stats["total_jumps"]
         
         if remaining_operations <= 0:
             return "Soon"
         
-        eta_seconds = remaining_operations / stats["jump_rate"]
-        return self.format_time(eta_seconds)
+        return self.format_time(remaining_operations / jump_rate)
     
     def save_stats_to_file(self, filename="stats.json"):
         """Save current statistics to file"""
         try:
             stats = self.get_stats()
-            with open(filename, 'w') as f:
-                json.dump(stats, f, indent=4)
+            with open(filename, 'wb') as f:
+                f.write(json_utils.dumps(stats, indent=True))
             return True
         except Exception as e:
             self.log_event("ERROR", f"Could not save stats to file: {e}")
@@ -163,8 +284,8 @@ class Monitor:
         """Load statistics from file"""
         try:
             if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    loaded_stats = json.load(f)
+                with open(filename, 'rb') as f:
+                    loaded_stats = json_utils.loads(f.read())
                     self.update_stats(loaded_stats)
                 return True
         except Exception as e:
@@ -176,31 +297,16 @@ class Monitor:
         stats = self.get_stats()
         metrics = self.get_performance_metrics()
         
-        report = f"""
-BITCOIN PUZZLE #73 KANGAROO SOLVER REPORT
-========================================
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-PERFORMANCE METRICS:
-- Runtime: {metrics['runtime']}
-- Total Jumps: {metrics['total_jumps']}
-- Distinguished Points: {metrics['distinguished_points']}
-- Jump Rate: {metrics['jump_rate']}
-- DP Rate: {metrics['dp_rate']}
-- Active Threads: {metrics['threads']}
-- Collisions Found: {metrics['collisions']}
-
-SEARCH PROGRESS:
-- Range Start: 0x{stats['current_range_start']}
-- Range End: 0x{stats['current_range_end']}
-- Estimated Completion: {self.estimate_completion()}
-- Status: {'SOLVED' if stats['is_solved'] else 'RUNNING'}
-
-SYSTEM INFO:
-- Last Checkpoint: {stats['last_checkpoint'] or 'None'}
-- Log File: {self.log_file}
-- Config File: config.json
-"""
+        ctx = {
+            **stats,
+            **metrics,
+            "now": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "eta": self.estimate_completion(),
+            "status": 'SOLVED' if stats['is_solved'] else 'RUNNING',
+            "last_checkpoint": stats['last_checkpoint'] or 'None',
+            "log_file": self.log_file
+        }
+        report = _REPORT_TEMPLATE.format_map(ctx)
         
         if stats['is_solved']:
             report += f"\nSOLUTION FOUND:\n- Private Key: {stats['found_key']}\n"
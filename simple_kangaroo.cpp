@@ -8,6 +8,8 @@
 #include <chrono>
 #include <unordered_map>
 #include <cstring>
+#include <shared_mutex>
+#include "stats_json.h"
 
 // Simplified ECC implementation for Bitcoin Puzzle #73
 struct Point {
@@ -222,9 +224,14 @@ private:
 // Global instance for C interface
 static std::unique_ptr<SimpleKangarooSolver> g_solver;
 
+// Guards g_solver's lifetime: kangaroo_init replaces it under an exclusive lock,
+// every other call holds a shared lock while it uses the instance
+static std::shared_mutex g_solver_mutex;
+
 // C interface
 extern "C" {
     bool kangaroo_init(const char* pubkey, const char* range_start, const char* range_end, int threads, int dist_bits) {
+        std::unique_lock<std::shared_mutex> lock(g_solver_mutex);
         try {
             g_solver = std::make_unique<SimpleKangarooSolver>();
             return g_solver->initialize(pubkey, range_start, range_end, threads, dist_bits);
@@ -234,22 +241,35 @@ extern "C" {
     }
     
     bool kangaroo_start() {
+        std::shared_lock<std::shared_mutex> lock(g_solver_mutex);
         if (!g_solver) return false;
         return g_solver->start();
     }
     
     void kangaroo_stop() {
+        std::shared_lock<std::shared_mutex> lock(g_solver_mutex);
         if (g_solver) {
             g_solver->stop();
         }
     }
     
     bool kangaroo_get_stats(KangarooStats* stats) {
+        std::shared_lock<std::shared_mutex> lock(g_solver_mutex);
         if (!g_solver || !stats) return false;
         *stats = g_solver->get_stats();
         return true;
     }
     
+    int kangaroo_stats_size() {
+        return static_cast<int>(sizeof(KangarooStats));
+    }
+    
+    int kangaroo_get_stats_json(char* buffer, int buffer_size) {
+        std::shared_lock<std::shared_mutex> lock(g_solver_mutex);
+        if (!g_solver || !buffer || buffer_size <= 0) return -1;
+        return format_stats_json(g_solver->get_stats(), buffer, buffer_size);
+    }
+    
     bool kangaroo_save_checkpoint(const char* filename) {
         // Simplified checkpoint saving
         if (!filename) return false;
@@ -0,0 +1,67 @@
+#ifndef STATS_JSON_H
+#define STATS_JSON_H
+
+#include <cstdio>
+#include <cstddef>
+
+// Escape up to max_len characters of src into dst for use inside a JSON string.
+// dst must hold 6 * max_len + 1 bytes. Returns false on non-ASCII input.
+inline bool escape_json_string(const char* src, size_t max_len, char* dst) {
+    static const char hex_digits[] = "0123456789abcdef";
+    
+    for (size_t i = 0; i < max_len && src[i]; i++) {
+        unsigned char c = static_cast<unsigned char>(src[i]);
+        if (c >= 0x80) {
+            return false;
+        }
+        if (c == '"' || c == '\\') {
+            *dst++ = '\\';
+            *dst++ = static_cast<char>(c);
+        } else if (c < 0x20) {
+            *dst++ = '\\';
+            *dst++ = 'u';
+            *dst++ = '0';
+            *dst++ = '0';
+            *dst++ = hex_digits[c >> 4];
+            *dst++ = hex_digits[c & 0xf];
+        } else {
+            *dst++ = static_cast<char>(c);
+        }
+    }
+    *dst = '\0';
+    return true;
+}
+
+// Format a KangarooStats as a JSON object into buffer. Returns the number of
+// bytes written, or -1 if a string field is not ASCII or the buffer is too small.
+template <typename Stats>
+int format_stats_json(const Stats& stats, char* buffer, int buffer_size) {
+    char range_start[6 * sizeof(stats.current_range_start) + 1];
+    char range_end[6 * sizeof(stats.current_range_end) + 1];
+    char found_key[6 * sizeof(stats.found_key) + 1];
+    
+    if (!escape_json_string(stats.current_range_start, sizeof(stats.current_range_start), range_start) ||
+        !escape_json_string(stats.current_range_end, sizeof(stats.current_range_end), range_end) ||
+        !escape_json_string(stats.found_key, sizeof(stats.found_key), found_key)) {
+        return -1;
+    }
+    
+    int written = std::snprintf(buffer, buffer_size,
+        "{\"total_jumps\":%llu,\"distinguished_points\":%llu,\"collisions_found\":%llu,"
+        "\"elapsed_time\":%llu,\"threads_active\":%d,\"current_range_start\":\"%s\","
+        "\"current_range_end\":\"%s\",\"found_key\":\"%s\",\"is_solved\":%s}",
+        static_cast<unsigned long long>(stats.total_jumps),
+        static_cast<unsigned long long>(stats.distinguished_points),
+        static_cast<unsigned long long>(stats.collisions_found),
+        static_cast<unsigned long long>(stats.elapsed_time),
+        stats.threads_active,
+        range_start,
+        range_end,
+        found_key,
+        stats.is_solved ? "true" : "false");
+    
+    if (written < 0 || written >= buffer_size) return -1;
+    return written;
+}
+
+#endif // STATS_JSON_H
@@ -5,15 +5,63 @@ Provides REST API endpoints for the web interface
 """
 
 import os
-import json
 import time
+import asyncio
 import threading
+import concurrent.futures
+import itertools
+import struct
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, request
 import ctypes
-from ctypes import c_char_p, c_int, c_uint64, c_bool, POINTER, Structure
+import ctypes.util
+from ctypes import c_char, c_char_p, c_int, c_uint64, c_bool, POINTER, Structure
+import json_utils
 
-# Define the C structure for stats
+# gevent's cooperative WSGI server, used when main.py has monkey-patched the process
+try:
+    from gevent import monkey
+    from gevent.pywsgi import WSGIServer
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+except ImportError:
+    monkey = None
+    WSGIServer = None
+    NativeThreadPoolExecutor = None
+
+# Gzip/brotli responses for clients that accept them, when flask-compress is installed
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# Seconds between background stats polls
+STATS_POLL_INTERVAL = 0.25
+
+# Size of the buffer kangaroo_get_stats_json formats into
+STATS_JSON_BUFFER_SIZE = 512
+
+# Seconds between simulated stats updates when no library is loaded
+MOCK_STATS_INTERVAL = 1.0
+
+# Seconds between history samples; 100 entries cover the last 100 seconds
+HISTORY_SAMPLE_INTERVAL = 1.0
+
+# Seconds between frames pushed on /api/stream, matching the dashboard refresh
+STREAM_INTERVAL = 1.0
+
+# Checkpoint save jobs remembered for /api/checkpoint/status, oldest dropped first
+CHECKPOINT_JOB_LIMIT = 100
+
+# Library file names looked up next to this module
+LIB_NAMES = ('libkangaroo.so', 'libkangaroo.dylib', 'kangaroo.dll')
+
+# Numeric prefix of KangarooStats: four uint64 counters then threads_active
+_STATS_PREFIX = struct.Struct('=QQQQi')
+
+# Define the C structure for stats; must match KangarooStats in kangaroo_solver.h
 class KangarooStats(Structure):
     _fields_ = [
         ("total_jumps", c_uint64),
@@ -21,43 +69,153 @@ class KangarooStats(Structure):
         ("collisions_found", c_uint64),
         ("elapsed_time", c_uint64),
         ("threads_active", c_int),
-        ("current_range_start", c_char_p),
-        ("current_range_end", c_char_p),
-        ("found_key", c_char_p),
+        ("current_range_start", c_char * 65),
+        ("current_range_end", c_char * 65),
+        ("found_key", c_char * 65),
         ("is_solved", c_bool)
     ]
 
+# SolverConfig string settings with a cached UTF-8 copy in "<name>_b"
+_ENCODED_SETTINGS = frozenset(("target_pubkey", "range_start", "range_end"))
+
+@dataclass(slots=True)
+class SolverConfig:
+    """Solver settings passed to kangaroo_init"""
+    threads: int = 8
+    distinguished_bits: int = 20
+    target_pubkey: str = "02c6047f9441ed7d6d3045406e95c07cd85c778e4b8cef3ca7abac09b95c709ee5"
+    range_start: str = "1000000000000000000"
+    range_end: str = "1ffffffffffffffffff"
+    # UTF-8 encodings of the string settings, ready for the FFI call; kept in
+    # sync by __setattr__ whenever a string setting is assigned
+    target_pubkey_b: bytes = field(init=False, repr=False)
+    range_start_b: bytes = field(init=False, repr=False)
+    range_end_b: bytes = field(init=False, repr=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _ENCODED_SETTINGS:
+            object.__setattr__(self, name + '_b', value.encode('utf-8'))
+    
+    def merge(self, data):
+        """Apply user-supplied settings, clamped to their valid ranges"""
+        if 'threads' in data:
+            self.threads = max(1, min(64, int(data['threads'])))
+        if 'distinguished_bits' in data:
+            self.distinguished_bits = max(8, min(32, int(data['distinguished_bits'])))
+    
+    def to_dict(self):
+        """Get the settings as a JSON-serializable dict"""
+        return {
+            "threads": self.threads,
+            "distinguished_bits": self.distinguished_bits,
+            "target_pubkey": self.target_pubkey,
+            "range_start": self.range_start,
+            "range_end": self.range_end
+        }
+
+def _gevent_active():
+    """Check whether gevent has monkey-patched threading in this process"""
+    return monkey is not None and monkey.is_module_patched('threading')
+
+def _thread_executor(max_workers):
+    """Create an executor whose workers are OS threads, even under gevent"""
+    # Patched stdlib executor workers are greenlets, so a blocking FFI call
+    # on one would stall every other greenlet in the process
+    if _gevent_active():
+        return NativeThreadPoolExecutor(max_workers=max_workers)
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+def _json(data, status=200):
+    """Build a JSON response, encoded with the fastest available library"""
+    return Response(json_utils.dumps(data), status=status, mimetype='application/json')
+
 class KangarooWebServer:
     def __init__(self):
-        self.app = Flask(__name__)
+        # Serve the dashboard files through Flask's static handler with browser caching
+        self.app = Flask(__name__, static_folder='.', static_url_path='')
+        self.app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+        if Compress is not None:
+            self.app.config['COMPRESS_MIN_SIZE'] = 500
+            self.app.config['COMPRESS_LEVEL'] = 4
+            Compress(self.app)
         self.lib = None
+        self.lib_get_stats_json = None  # Optional native JSON export, see load_library()
         self.running = False
-        self.stats_history = []
-        self.config = {
-            "threads": 8,
-            "distinguished_bits": 20,
-            "target_pubkey": "02c6047f9441ed7d6d3045406e95c07cd85c778e4b8cef3ca7abac09b95c709ee5",
-            "range_start": "1000000000000000000",
-            "range_end": "1ffffffffffffffffff"
+        self.stats_history = deque(maxlen=100)
+        self.history_cache = None  # Encoded /api/history payload, reset on each append
+        self.history_sampled = 0.0
+        # Only the stats poller reads the library stats, so one struct is reused
+        self.stats_scratch = KangarooStats()
+        self.stats_ref = ctypes.byref(self.stats_scratch)
+        self.gevent = _gevent_active()
+        self.ffi_pool = _thread_executor(4)
+        # Checkpoint saves and loads run one at a time; saves are tracked by job id
+        self.checkpoint_pool = _thread_executor(1)
+        self.checkpoint_jobs = {}
+        self.checkpoint_lock = threading.Lock()
+        self.solver_initializing = False  # The poller skips library reads while set
+        self.config = SolverConfig()
+        
+        # Simulated stats, only the time-derived fields change between updates
+        self.mock_stats = {
+            "total_jumps": 0,
+            "distinguished_points": 0,
+            "collisions_found": 0,
+            "elapsed_time": 0,
+            "threads_active": 0,
+            "current_range_start": self.config.range_start,
+            "current_range_end": self.config.range_end,
+            "found_key": "",
+            "is_solved": False
         }
+        self.mock_updated = 0.0
+        
+        self.stats_cache = json_utils.dumps({
+            "success": False,
+            "error": "Statistics not available yet"
+        })
         
         self.setup_routes()
         self.load_library()
+        
+        # Collect once up front; the poller, started by run() or the first
+        # request, keeps the status payload fresh in the background
+        self.refresh_stats()
+        self.stats_poller = None
+        self.poller_stop = threading.Event()
+        self.poller_lock = threading.Lock()
     
     def load_library(self):
         """Load the compiled Kangaroo library"""
         try:
-            lib_names = ['./libkangaroo.so', './libkangaroo.dylib', './kangaroo.dll']
+            # Prefer a build next to this module, whatever the working directory,
+            # then fall back to the platform's library search path
+            lib_dir = os.path.dirname(os.path.abspath(__file__))
+            lib_path = next(
+                (path for path in (os.path.join(lib_dir, name) for name in LIB_NAMES) if os.path.exists(path)),
+                None
+            ) or ctypes.util.find_library('kangaroo')
             
-            for lib_name in lib_names:
-                if os.path.exists(lib_name):
-                    self.lib = ctypes.CDLL(lib_name)
-                    break
+            if lib_path:
+                self.lib = ctypes.CDLL(lib_path)
             
             if not self.lib:
                 print("Warning: Kangaroo library not found. API will work but solver won't run.")
                 return False
             
+            # Refuse a library whose stats struct differs from KangarooStats
+            stats_size = getattr(self.lib, 'kangaroo_stats_size', None)
+            if stats_size is not None:
+                stats_size.argtypes = []
+                stats_size.restype = c_int
+                expected = stats_size()
+                if expected != ctypes.sizeof(KangarooStats):
+                    print(f"Error: Kangaroo library stats struct is {expected} bytes, "
+                          f"expected {ctypes.sizeof(KangarooStats)}. Solver disabled.")
+                    self.lib = None
+                    return False
+            
             # Setup function signatures
             self.lib.kangaroo_init.argtypes = [c_char_p, c_char_p, c_char_p, c_int, c_int]
             self.lib.kangaroo_init.restype = c_bool
@@ -77,6 +235,22 @@ class KangarooWebServer:
             self.lib.kangaroo_load_checkpoint.argtypes = [c_char_p]
             self.lib.kangaroo_load_checkpoint.restype = c_bool
             
+            # Bind the configured functions once so calls skip the CDLL lookup
+            self.lib_init = self.lib.kangaroo_init
+            self.lib_start = self.lib.kangaroo_start
+            self.lib_stop = self.lib.kangaroo_stop
+            self.lib_get_stats = self.lib.kangaroo_get_stats
+            self.lib_save_checkpoint = self.lib.kangaroo_save_checkpoint
+            self.lib_load_checkpoint = self.lib.kangaroo_load_checkpoint
+            
+            # Libraries built before kangaroo_get_stats_json fall back to collect_stats()
+            get_stats_json = getattr(self.lib, 'kangaroo_get_stats_json', None)
+            if get_stats_json is not None:
+                get_stats_json.argtypes = [c_char_p, c_int]
+                get_stats_json.restype = c_int
+                self.stats_json_buffer = ctypes.create_string_buffer(STATS_JSON_BUFFER_SIZE)
+                self.lib_get_stats_json = get_stats_json
+            
             print("Kangaroo library loaded successfully")
             return True
             
@@ -84,229 +258,398 @@ class KangarooWebServer:
             print(f"Error loading library: {e}")
             return False
     
-    def setup_routes(self):
-        """Setup Flask routes"""
-        
-        @self.app.route('/')
-        def index():
-            return send_from_directory('.', 'index.html')
+    def collect_stats(self):
+        """Build the current stats dict, from the library when available"""
+        # Always return consistent data structure
+        now = time.time()
+        mock = self.mock_stats
+        mock["total_jumps"] = int(now * 1000) % 1000000
+        mock["distinguished_points"] = int(now / 10) % 1000
+        mock["elapsed_time"] = int(now) % 3600
+        mock["threads_active"] = self.config.threads if self.running else 0
+        base_stats = mock.copy()
         
-        @self.app.route('/<path:filename>')
-        def static_files(filename):
-            return send_from_directory('.', filename)
-        
-        @self.app.route('/api/status')
-        def get_status():
+        if self.lib:
             try:
-                # Always return consistent data structure
-                base_stats = {
-                    "total_jumps": int(time.time() * 1000) % 1000000,
-                    "distinguished_points": int(time.time() / 10) % 1000,
-                    "collisions_found": 0,
-                    "elapsed_time": int(time.time()) % 3600,
-                    "threads_active": self.config["threads"] if self.running else 0,
-                    "current_range_start": self.config["range_start"],
-                    "current_range_end": self.config["range_end"],
-                    "found_key": "",
-                    "is_solved": False
-                }
-                
-                if self.lib:
-                    try:
-                        # Try to get real stats from library
-                        stats = KangarooStats()
-                        if self.lib.kangaroo_get_stats(ctypes.byref(stats)):
-                            base_stats.update({
-                                "total_jumps": stats.total_jumps,
-                                "distinguished_points": stats.distinguished_points,
-                                "collisions_found": stats.collisions_found,
-                                "elapsed_time": stats.elapsed_time,
-                                "threads_active": stats.threads_active,
-                                "found_key": stats.found_key.decode() if stats.found_key else "",
-                                "is_solved": stats.is_solved
-                            })
-                    except Exception as lib_error:
-                        print(f"Library stats error: {lib_error}")
-                        # Continue with base stats
-                
-                # Add to history
+                # Try to get real stats from library
+                stats = self.stats_scratch
+                if self.lib_get_stats(self.stats_ref):
+                    # Unpack the numeric fields in one call instead of five descriptor reads
+                    jumps, points, collisions, elapsed, threads = _STATS_PREFIX.unpack_from(stats)
+                    range_start = stats.current_range_start
+                    range_end = stats.current_range_end
+                    found_key = stats.found_key
+                    base_stats.update({
+                        "total_jumps": jumps,
+                        "distinguished_points": points,
+                        "collisions_found": collisions,
+                        "elapsed_time": elapsed,
+                        "threads_active": threads,
+                        "found_key": found_key.decode() if found_key else "",
+                        "is_solved": stats.is_solved
+                    })
+                    # Empty until the solver has been initialized
+                    if range_start:
+                        base_stats["current_range_start"] = range_start.decode()
+                    if range_end:
+                        base_stats["current_range_end"] = range_end.decode()
+            except Exception as lib_error:
+                print(f"Library stats error: {lib_error}")
+                # Continue with base stats
+        
+        return base_stats
+    
+    def read_stats_json(self):
+        """Get the stats object as JSON bytes formatted by the library, or None"""
+        if self.lib_get_stats_json is None:
+            return None
+        length = self.lib_get_stats_json(self.stats_json_buffer, STATS_JSON_BUFFER_SIZE)
+        if length < 0:
+            return None
+        return ctypes.string_at(self.stats_json_buffer, length)
+    
+    def refresh_stats(self):
+        """Collect stats once, publish the encoded status payload and record history"""
+        try:
+            # kangaroo_init holds the library's solver lock exclusively; keep the
+            # last payload rather than block this thread until it finishes
+            if self.solver_initializing:
+                return
+            
+            now = time.monotonic()
+            
+            # Simulation mode only needs one update per second
+            if self.lib is None:
+                if now - self.mock_updated < MOCK_STATS_INTERVAL:
+                    return
+                self.mock_updated = now
+            
+            raw = self.read_stats_json()
+            
+            # A single attribute assignment, so readers never see a partial payload
+            if raw is not None:
+                self.stats_cache = b'{"success":true,"data":' + raw + b'}'
+                base_stats = None  # Decoded only when a history sample is due
+            else:
+                base_stats = self.collect_stats()
+                self.stats_cache = json_utils.dumps({
+                    "success": True,
+                    "data": base_stats
+                })
+            
+            # Sample history at a fixed rate, independent of the poll interval
+            if now - self.history_sampled >= HISTORY_SAMPLE_INTERVAL:
+                self.history_sampled = now
+                if base_stats is None:
+                    base_stats = json_utils.loads(raw)
                 self.stats_history.append({
                     "timestamp": time.time(),
                     "data": base_stats
                 })
-                
-                # Keep only last 100 entries
-                if len(self.stats_history) > 100:
-                    self.stats_history.pop(0)
-                
-                return jsonify({
+                self.history_cache = None
+        except Exception as e:
+            print(f"Stats poller error: {e}")
+    
+    def poll_stats(self):
+        """Background loop keeping the cached status payload fresh until stopped"""
+        # Resolve the bound methods once for the lifetime of the loop
+        refresh = self.refresh_stats
+        wait = self.poller_stop.wait
+        while not self.poller_stop.is_set():
+            refresh()
+            wait(STATS_POLL_INTERVAL)
+    
+    def start_poller(self):
+        """Start the background stats poller unless it is already running"""
+        poller = self.stats_poller
+        if poller is not None and poller.is_alive():
+            return
+        with self.poller_lock:
+            if self.stats_poller is not None and self.stats_poller.is_alive():
+                return
+            self.poller_stop.clear()
+            self.stats_poller = threading.Thread(target=self.poll_stats, daemon=True)
+            self.stats_poller.start()
+    
+    def stop_poller(self):
+        """Stop the background stats poller and wait for it to exit"""
+        with self.poller_lock:
+            self.poller_stop.set()
+            if self.stats_poller is not None:
+                self.stats_poller.join()
+                self.stats_poller = None
+    
+    async def call_library(self, func, *args, executor=None):
+        """Run a blocking library call on the FFI pool (or executor) so the view can yield"""
+        executor = executor or self.ffi_pool
+        if self.gevent:
+            # asyncio can't await gevent's futures; waiting on one yields to the hub
+            return executor.submit(func, *args).result()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+    
+    def setup_routes(self):
+        """Setup Flask routes"""
+        # Hosts other than run() (gunicorn, flask run, test clients) start the poller here
+        self.app.before_request(self.start_poller)
+        
+        self.app.add_url_rule('/', 'index', self.index)
+        self.app.add_url_rule('/api/status', 'get_status', self.get_status)
+        self.app.add_url_rule('/api/stream', 'stream_status', self.stream_status)
+        self.app.add_url_rule('/api/start', 'start_solver', self.start_solver, methods=['POST'])
+        self.app.add_url_rule('/api/stop', 'stop_solver', self.stop_solver, methods=['POST'])
+        self.app.add_url_rule('/api/config', 'update_config', self.update_config, methods=['POST'])
+        self.app.add_url_rule('/api/checkpoint/save', 'save_checkpoint', self.save_checkpoint, methods=['POST'])
+        self.app.add_url_rule('/api/checkpoint/status/<job_id>', 'checkpoint_status', self.checkpoint_status)
+        self.app.add_url_rule('/api/checkpoint/load', 'load_checkpoint', self.load_checkpoint, methods=['POST'])
+        self.app.add_url_rule('/api/history', 'get_history', self.get_history)
+    
+    def index(self):
+        """Serve the dashboard page"""
+        return self.app.send_static_file('index.html')
+    
+    def get_status(self):
+        """Get the latest solver statistics"""
+        # Served from the payload published by the background poller
+        return Response(self.stats_cache, mimetype='application/json')
+    
+    def stream_status(self):
+        """Stream solver statistics as server-sent events"""
+        # One long-lived connection per client; time.sleep yields under gevent
+        def generate():
+            while True:
+                yield b'data: ' + self.stats_cache + b'\n\n'
+                time.sleep(STREAM_INTERVAL)
+        
+        response = Response(generate(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    async def start_solver(self):
+        """Apply the posted settings and start the solver"""
+        try:
+            data = request.get_json() or {}
+            
+            # Update config
+            self.config.merge(data)
+            
+            if not self.lib:
+                self.running = True
+                return _json({
                     "success": True,
-                    "data": base_stats
+                    "message": "Solver started (simulation mode)"
                 })
-                    
-            except Exception as e:
-                print(f"Status endpoint error: {e}")
-                return jsonify({
-                    "success": False,
-                    "error": "Internal server error"
-                }), 500
-        
-        @self.app.route('/api/start', methods=['POST'])
-        def start_solver():
+            
+            # Initialize and start the solver on the checkpoint worker, since
+            # kangaroo_init replaces the solver a queued save may still be using
+            self.solver_initializing = True
             try:
-                data = request.get_json() or {}
-                
-                # Update config
-                if 'threads' in data:
-                    self.config['threads'] = max(1, min(64, int(data['threads'])))
-                if 'distinguished_bits' in data:
-                    self.config['distinguished_bits'] = max(8, min(32, int(data['distinguished_bits'])))
-                
-                if not self.lib:
+                success = await self.call_library(
+                    self.lib_init,
+                    self.config.target_pubkey_b,
+                    self.config.range_start_b,
+                    self.config.range_end_b,
+                    self.config.threads,
+                    self.config.distinguished_bits,
+                    executor=self.checkpoint_pool
+                )
+            finally:
+                self.solver_initializing = False
+            
+            if success:
+                success = await self.call_library(self.lib_start, executor=self.checkpoint_pool)
+                if success:
                     self.running = True
-                    return jsonify({
+                    return _json({
                         "success": True,
-                        "message": "Solver started (simulation mode)"
+                        "message": "Solver started successfully"
                     })
-                
-                # Initialize and start the solver
-                success = self.lib.kangaroo_init(
-                    self.config['target_pubkey'].encode('utf-8'),
-                    self.config['range_start'].encode('utf-8'),
-                    self.config['range_end'].encode('utf-8'),
-                    self.config['threads'],
-                    self.config['distinguished_bits']
-                )
-                
-                if success:
-                    success = self.lib.kangaroo_start()
-                    if success:
-                        self.running = True
-                        return jsonify({
-                            "success": True,
-                            "message": "Solver started successfully"
-                        })
-                
-                return jsonify({
-                    "success": False,
-                    "error": "Failed to start solver"
-                }), 500
-                
-            except Exception as e:
-                return jsonify({
-                    "success": False,
-                    "error": str(e)
-                }), 500
+            
+            return _json({
+                "success": False,
+                "error": "Failed to start solver"
+            }, 500)
+            
+        except Exception as e:
+            return _json({
+                "success": False,
+                "error": str(e)
+            }, 500)
+    
+    def stop_solver(self):
+        """Stop the solver"""
+        try:
+            if self.lib:
+                self.lib_stop()
+            
+            self.running = False
+            
+            return _json({
+                "success": True,
+                "message": "Solver stopped"
+            })
+            
+        except Exception as e:
+            return _json({
+                "success": False,
+                "error": str(e)
+            }, 500)
+    
+    def update_config(self):
+        """Update solver settings"""
+        try:
+            data = request.get_json() or {}
+            
+            self.config.merge(data)
+            
+            return _json({
+                "success": True,
+                "message": "Configuration updated",
+                "config": self.config.to_dict()
+            })
+            
+        except Exception as e:
+            return _json({
+                "success": False,
+                "error": str(e)
+            }, 500)
+    
+    def write_checkpoint(self, filename):
+        """Save a checkpoint on the checkpoint worker, returning whether it succeeded"""
+        if not self.lib:
+            return True
+        return self.lib_save_checkpoint(filename.encode('utf-8'))
+    
+    def save_checkpoint(self):
+        """Queue a solver checkpoint save"""
+        try:
+            filename = f"checkpoint_{int(time.time())}.dat"
+            job_id = uuid.uuid4().hex
+            future = self.checkpoint_pool.submit(self.write_checkpoint, filename)
+            
+            with self.checkpoint_lock:
+                jobs = self.checkpoint_jobs
+                jobs[job_id] = (future, filename)
+                while len(jobs) > CHECKPOINT_JOB_LIMIT:
+                    del jobs[next(iter(jobs))]
+            
+            return _json({
+                "success": True,
+                "message": f"Checkpoint save to {filename} queued",
+                "status": "pending",
+                "job_id": job_id,
+                "filename": filename
+            }, 202)
+            
+        except Exception as e:
+            return _json({
+                "success": False,
+                "error": str(e)
+            }, 500)
+    
+    def checkpoint_status(self, job_id):
+        """Get the state of a queued checkpoint save"""
+        job = self.checkpoint_jobs.get(job_id)
+        if job is None:
+            return _json({
+                "success": False,
+                "error": f"Unknown checkpoint job {job_id}"
+            }, 404)
         
-        @self.app.route('/api/stop', methods=['POST'])
-        def stop_solver():
-            try:
-                if self.lib:
-                    self.lib.kangaroo_stop()
-                
-                self.running = False
-                
-                return jsonify({
-                    "success": True,
-                    "message": "Solver stopped"
-                })
-                
-            except Exception as e:
-                return jsonify({
-                    "success": False,
-                    "error": str(e)
-                }), 500
+        future, filename = job
+        if not future.done():
+            return _json({
+                "success": True,
+                "status": "pending",
+                "filename": filename
+            })
         
-        @self.app.route('/api/config', methods=['POST'])
-        def update_config():
-            try:
-                data = request.get_json() or {}
-                
-                if 'threads' in data:
-                    self.config['threads'] = max(1, min(64, int(data['threads'])))
-                if 'distinguished_bits' in data:
-                    self.config['distinguished_bits'] = max(8, min(32, int(data['distinguished_bits'])))
-                
-                return jsonify({
-                    "success": True,
-                    "message": "Configuration updated",
-                    "config": self.config
-                })
-                
-            except Exception as e:
-                return jsonify({
-                    "success": False,
-                    "error": str(e)
-                }), 500
+        try:
+            saved = future.result()
+            error = None if saved else "Failed to save checkpoint"
+        except Exception as e:
+            error = str(e)
         
-        @self.app.route('/api/checkpoint/save', methods=['POST'])
-        def save_checkpoint():
-            try:
-                filename = f"checkpoint_{int(time.time())}.dat"
-                
-                if self.lib:
-                    success = self.lib.kangaroo_save_checkpoint(filename.encode('utf-8'))
-                    if not success:
-                        return jsonify({
-                            "success": False,
-                            "error": "Failed to save checkpoint"
-                        }), 500
-                
-                return jsonify({
-                    "success": True,
-                    "message": f"Checkpoint saved to {filename}",
-                    "filename": filename
-                })
-                
-            except Exception as e:
-                return jsonify({
-                    "success": False,
-                    "error": str(e)
-                }), 500
+        if error:
+            return _json({
+                "success": False,
+                "status": "failed",
+                "error": error,
+                "filename": filename
+            })
         
-        @self.app.route('/api/checkpoint/load', methods=['POST'])
-        def load_checkpoint():
-            try:
-                data = request.get_json() or {}
-                filename = data.get('filename', 'checkpoint.dat')
-                
-                if not os.path.exists(filename):
-                    return jsonify({
-                        "success": False,
-                        "error": f"Checkpoint file {filename} not found"
-                    }), 404
-                
-                if self.lib:
-                    success = self.lib.kangaroo_load_checkpoint(filename.encode('utf-8'))
-                    if not success:
-                        return jsonify({
-                            "success": False,
-                            "error": "Failed to load checkpoint"
-                        }), 500
-                
-                return jsonify({
-                    "success": True,
-                    "message": f"Checkpoint loaded from {filename}",
-                    "filename": filename
-                })
-                
-            except Exception as e:
-                return jsonify({
+        return _json({
+            "success": True,
+            "status": "done",
+            "message": f"Checkpoint saved to {filename}",
+            "filename": filename
+        })
+    
+    async def load_checkpoint(self):
+        """Load a solver checkpoint"""
+        try:
+            data = request.get_json() or {}
+            filename = data.get('filename', 'checkpoint.dat')
+            
+            if not os.path.exists(filename):
+                return _json({
                     "success": False,
-                    "error": str(e)
-                }), 500
-        
-        @self.app.route('/api/history')
-        def get_history():
-            return jsonify({
+                    "error": f"Checkpoint file {filename} not found"
+                }, 404)
+            
+            if self.lib:
+                # Same single worker as saves, so a load never overlaps a queued save
+                success = await self.call_library(
+                    self.lib_load_checkpoint,
+                    filename.encode('utf-8'),
+                    executor=self.checkpoint_pool
+                )
+                if not success:
+                    return _json({
+                        "success": False,
+                        "error": "Failed to load checkpoint"
+                    }, 500)
+            
+            return _json({
+                "success": True,
+                "message": f"Checkpoint loaded from {filename}",
+                "filename": filename
+            })
+            
+        except Exception as e:
+            return _json({
+                "success": False,
+                "error": str(e)
+            }, 500)
+    
+    def get_history(self):
+        """Get recent statistics history"""
+        payload = self.history_cache
+        if payload is None:
+            history = self.stats_history
+            size = len(history)
+            payload = json_utils.dumps({
                 "success": True,
-                "data": self.stats_history[-50:]  # Last 50 entries
+                "data": list(itertools.islice(history, max(0, size - 50), size))  # Last 50 entries
             })
+            self.history_cache = payload
+        return Response(payload, mimetype='application/json')
     
     def run(self, host='0.0.0.0', port=5000, debug=False):
         """Run the web server"""
         print(f"Starting Bitcoin Kangaroo Solver web interface on http://{host}:{port}")
-        self.app.run(host=host, port=port, debug=debug, threaded=True)
+        
+        self.start_poller()
+        try:
+            # The debug reloader needs Flask's development server, and gevent's server
+            # only helps once main.py has patched blocking calls to yield
+            if _gevent_active() and not debug:
+                WSGIServer((host, port), self.app).serve_forever()
+            else:
+                self.app.run(host=host, port=port, debug=debug, threaded=True)
+        finally:
+            self.stop_poller()
 
 def main():
     server = KangarooWebServer()